@@ -0,0 +1,22 @@
+"""JSON encode/decode helpers for provider traffic, backed by orjson when installed."""
+
+from typing import Any
+
+try:
+    import orjson
+
+    def dumps(obj: Any) -> bytes:
+        """Serialize obj to compact JSON bytes."""
+        return orjson.dumps(obj)
+
+    # orjson.JSONDecodeError subclasses ValueError, like json's
+    loads = orjson.loads
+
+except ImportError:
+    import json
+
+    def dumps(obj: Any) -> bytes:
+        """Serialize obj to compact JSON bytes."""
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    loads = json.loads
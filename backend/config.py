@@ -1,25 +1,184 @@
 """Configuration for AI Peer Review."""
 
+import functools
+import json
 import os
-from dotenv import load_dotenv
+import tempfile
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from dotenv import dotenv_values, find_dotenv
 
-load_dotenv()
+# Resolved .env values are cached as JSON next to .env, so later boots skip
+# dotenv parsing. Git- and Docker-ignored; holds secrets, so it gets .env's mode.
+_ENV_CACHE_NAME = ".env.cache.json"
 
-# API Keys for different providers
-OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
-PERPLEXITY_API_KEY = os.getenv("PERPLEXITY_API_KEY")
-GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 
-# Council members - list of model identifiers from multiple providers
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """Environment-derived settings, resolved once per process."""
+
+    # API Keys for different providers
+    OPENROUTER_API_KEY: Optional[str]
+    PERPLEXITY_API_KEY: Optional[str]
+    GOOGLE_API_KEY: Optional[str]
+
+    # HTTP transport for provider API calls: "aiohttp" (default) or "httpx"
+    HTTP_CLIENT: str
+
+    # httpx connection pool limits. httpx defaults to 100 connections / 20 keep-alive,
+    # which makes large councils and concurrent sessions queue for a free slot; raise
+    # them the same way pydantic-ai works around it by passing explicit httpx.Limits.
+    HTTPX_MAX_CONNECTIONS: int
+    HTTPX_MAX_KEEPALIVE: int
+
+    # Key into COUNCIL_PROFILES selecting the council members
+    COUNCIL_PROFILE: str
+
+    # Max in-flight requests per provider, sized to each provider's rate-limit tier
+    OPENROUTER_CONCURRENCY: int
+    PERPLEXITY_CONCURRENCY: int
+    GEMINI_CONCURRENCY: int
+
+    # Pre-open provider connections at startup (COUNCIL_WARMUP=1)
+    COUNCIL_WARMUP: bool
+
+    # Root log level name (e.g. "WARNING", "INFO")
+    LOG_LEVEL: str
+
+
+def _env_fingerprint(env_stat: os.stat_result) -> List[int]:
+    """Identify a version of .env by its mtime (ns) and size."""
+    return [env_stat.st_mtime_ns, env_stat.st_size]
+
+
+def _compile_env_cache(cache_path: str, env_stat: os.stat_result, vals: Dict[str, str]):
+    """
+    Atomically write resolved .env values to the JSON cache.
+
+    Args:
+        cache_path: Destination cache file
+        env_stat: os.stat of the .env file the values were parsed from
+        vals: Key/value pairs parsed from .env
+    """
+    data = {"source": _env_fingerprint(env_stat), "env": vals}
+    try:
+        # Temp file + os.replace so concurrent workers never see a partial cache
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path), prefix=".env.cache.")
+        try:
+            os.fchmod(fd, env_stat.st_mode & 0o777)
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        # Read-only deploys just parse .env each boot
+        pass
+
+
+def _read_env_cache(cache_path: str, env_stat: os.stat_result) -> Optional[Dict[str, str]]:
+    """
+    Read cached .env values if they were built from this exact .env.
+
+    Args:
+        cache_path: Cache file written by _compile_env_cache
+        env_stat: os.stat of the current .env file
+
+    Returns:
+        Cached key/value pairs, or None if missing, stale or unreadable
+    """
+    try:
+        with open(cache_path, "r") as f:
+            data = json.load(f)
+        if data["source"] != _env_fingerprint(env_stat):
+            return None
+        vals = data["env"]
+        if isinstance(vals, dict) and all(isinstance(v, str) for v in vals.values()):
+            return vals
+    except Exception:
+        # Missing, truncated or hand-edited cache: fall back to parsing .env
+        pass
+    return None
+
+
+def _load_env_values() -> Dict[str, str]:
+    """
+    Get .env values, from the JSON cache when it matches the current .env.
+
+    Returns:
+        Key/value pairs from .env (empty if there is no .env file)
+    """
+    env_path = find_dotenv()
+    if not env_path:
+        return {}
+
+    env_stat = os.stat(env_path)
+    cache_path = os.path.join(os.path.dirname(env_path), _ENV_CACHE_NAME)
+
+    vals = _read_env_cache(cache_path, env_stat)
+    if vals is None:
+        vals = {k: v for k, v in dotenv_values(env_path).items() if v is not None}
+        _compile_env_cache(cache_path, env_stat, vals)
+    return vals
+
+
+@functools.lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Load .env and read settings from the environment.
+
+    Cached, so .env is read at most once per process. As with load_dotenv,
+    real environment variables take precedence over .env values.
+
+    Returns:
+        Frozen Settings instance
+    """
+    for key, value in _load_env_values().items():
+        os.environ.setdefault(key, value)
+
+    return Settings(
+        OPENROUTER_API_KEY=os.getenv("OPENROUTER_API_KEY"),
+        PERPLEXITY_API_KEY=os.getenv("PERPLEXITY_API_KEY"),
+        GOOGLE_API_KEY=os.getenv("GOOGLE_API_KEY"),
+        HTTP_CLIENT=os.getenv("HTTP_CLIENT", "aiohttp"),
+        HTTPX_MAX_CONNECTIONS=int(os.getenv("HTTPX_MAX_CONN", 500)),
+        HTTPX_MAX_KEEPALIVE=int(os.getenv("HTTPX_MAX_KEEPALIVE", 200)),
+        COUNCIL_PROFILE=os.getenv("COUNCIL_PROFILE", "multi_provider"),
+        OPENROUTER_CONCURRENCY=int(os.getenv("OPENROUTER_CONCURRENCY", 20)),
+        PERPLEXITY_CONCURRENCY=int(os.getenv("PERPLEXITY_CONCURRENCY", 5)),
+        GEMINI_CONCURRENCY=int(os.getenv("GEMINI_CONCURRENCY", 10)),
+        COUNCIL_WARMUP=os.getenv("COUNCIL_WARMUP") == "1",
+        LOG_LEVEL=os.getenv("LOG_LEVEL", "WARNING").upper(),
+    )
+
+
+# Council profiles - named lists of model identifiers, selected via COUNCIL_PROFILE
 # Prefix convention:
 #   - "perplexity/" for Perplexity models (e.g., "perplexity/sonar")
 #   - "gemini/" for Google Gemini models (e.g., "gemini/gemini-2.0-flash")
 #   - No prefix or other format for OpenRouter models (e.g., "x-ai/grok-4.1-fast:free")
-COUNCIL_MODELS = [
-    "x-ai/grok-4.1-fast:free",      # OpenRouter (free)
-    "perplexity/sonar",              # Perplexity direct API
-    "gemini/gemini-2.0-flash",       # Google Gemini direct API
-]
+COUNCIL_PROFILES: Dict[str, List[str]] = {
+    "multi_provider": [
+        "x-ai/grok-4.1-fast:free",      # OpenRouter (free)
+        "perplexity/sonar",              # Perplexity direct API
+        "gemini/gemini-2.0-flash",       # Google Gemini direct API
+    ],
+    "openrouter": [
+        "openai/gpt-4o",
+        "anthropic/claude-sonnet-4",
+        "google/gemini-2.5-flash",
+        "x-ai/grok-3",
+    ],
+}
+
+# Council members for this process
+if get_settings().COUNCIL_PROFILE not in COUNCIL_PROFILES:
+    raise ValueError(
+        f"Unknown COUNCIL_PROFILE {get_settings().COUNCIL_PROFILE!r}; "
+        f"expected one of {sorted(COUNCIL_PROFILES)}"
+    )
+COUNCIL_MODELS = COUNCIL_PROFILES[get_settings().COUNCIL_PROFILE]
 
 # Chairman model - synthesizes final response
 CHAIRMAN_MODEL = "perplexity/sonar"
@@ -27,5 +186,15 @@ CHAIRMAN_MODEL = "perplexity/sonar"
 # OpenRouter API endpoint
 OPENROUTER_API_URL = "https://openrouter.ai/api/v1/chat/completions"
 
+# Perplexity API endpoint (OpenAI-compatible)
+PERPLEXITY_API_URL = "https://api.perplexity.ai/chat/completions"
+
+# Google Gemini API base URL (append "/{model}:generateContent")
+GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1beta/models"
+
 # Data directory for conversation storage
 DATA_DIR = "data/conversations"
+
+# Per-model latency stats for adaptive timeouts (kept outside DATA_DIR so it
+# isn't listed as a conversation)
+LATENCY_STATS_PATH = "data/latency_stats.json"
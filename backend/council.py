@@ -1,32 +1,257 @@
 """3-stage AI Peer Review orchestration."""
 
-from typing import List, Dict, Any, Tuple
-from .openrouter import query_models_parallel, query_model, ModelError
-from .config import COUNCIL_MODELS, CHAIRMAN_MODEL
+import asyncio
+import time
+from typing import List, Dict, Any, Tuple, Optional, AsyncIterator
+from .openrouter import query_model, encode_messages, head, ModelError
+from .perplexity import query_perplexity_model
+from .gemini import query_gemini_model
+from .latency import latency_key, effective_timeout, record_latency, record_timeout
+from .config import (
+    get_settings,
+    COUNCIL_MODELS,
+    CHAIRMAN_MODEL,
+    OPENROUTER_API_URL,
+    PERPLEXITY_API_URL,
+    GEMINI_API_URL,
+)
+
+settings = get_settings()
+
+# Provider query functions keyed by model identifier prefix.
+# Models without a matching prefix go to OpenRouter (query_model).
+PROVIDERS = {
+    "perplexity/": query_perplexity_model,
+    "gemini/": query_gemini_model,
+}
+
+# Max concurrent requests per provider, across all sessions
+_CONCURRENCY = {
+    "openrouter": settings.OPENROUTER_CONCURRENCY,
+    "perplexity": settings.PERPLEXITY_CONCURRENCY,
+    "gemini": settings.GEMINI_CONCURRENCY,
+}
+
+# Created lazily so they bind to the running event loop
+_SEMAPHORES: Dict[str, asyncio.Semaphore] = {}
+
+
+def _semaphore(provider: str) -> asyncio.Semaphore:
+    """Get the concurrency semaphore for a provider, creating it on first use."""
+    if provider not in _SEMAPHORES:
+        _SEMAPHORES[provider] = asyncio.Semaphore(_CONCURRENCY[provider])
+    return _SEMAPHORES[provider]
+
+
+async def warmup():
+    """
+    Open keep-alive connections to every provider host ahead of the first turn.
 
+    Moves the TCP/TLS handshakes out of the user-visible first council query.
+    Response statuses (e.g. 4xx on a HEAD) and connection failures are ignored.
+    """
+    urls = [OPENROUTER_API_URL, PERPLEXITY_API_URL, GEMINI_API_URL]
+    await asyncio.gather(*(head(url) for url in urls), return_exceptions=True)
 
-async def stage1_collect_responses(user_query: str) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+
+async def _route(
+    model: str,
+    messages: List[Dict[str, str]],
+    timeout: float = 120.0,
+    messages_json: Optional[bytes] = None,
+    stage: Optional[str] = None
+) -> Tuple[Optional[Dict[str, Any]], Optional[Any]]:
     """
-    Stage 1: Collect individual responses from all council models.
+    Query a model via the provider matching its identifier prefix.
+
+    For council fan-out calls (stage given), the timeout is tightened from the
+    model's observed latency in that stage (see latency.py), so a dead
+    responder is abandoned early instead of holding up the council. One-off
+    calls (chairman, title) always use the caller's timeout.
+    Calls queue on a per-provider semaphore so bursts from concurrent sessions
+    stay under the provider's rate limit instead of triggering 429s. Time spent
+    queued comes out of the timeout; if no slot frees up in time, a 429 error
+    is returned without touching the latency stats.
 
     Args:
-        user_query: The user's question
+        model: Model identifier with optional provider prefix
+               - "perplexity/sonar" -> Perplexity API
+               - "gemini/gemini-2.0-flash" -> Google Gemini API
+               - "x-ai/grok-4.1-fast:free" -> OpenRouter API (default)
+        messages: List of message dicts with 'role' and 'content'
+        timeout: Maximum request timeout in seconds
+        messages_json: Optional encode_messages(messages) prefix shared across a fan-out
+        stage: Council stage name; enables adaptive timeouts keyed by (stage, model)
 
     Returns:
-        Tuple of (results list, errors list)
+        Tuple of (response dict, error). One will be None.
+    """
+    key = latency_key(model, stage) if stage else None
+    if key:
+        timeout = effective_timeout(key, timeout)
+
+    provider, query_fn = "openrouter", query_model
+    for prefix, provider_fn in PROVIDERS.items():
+        if model.startswith(prefix):
+            provider, query_fn = prefix.rstrip("/"), provider_fn
+            break
+
+    # The wait for a slot counts against the same deadline as the call
+    sem = _semaphore(provider)
+    t0 = time.perf_counter()
+    try:
+        await asyncio.wait_for(sem.acquire(), timeout)
+    except asyncio.TimeoutError:
+        return None, ModelError(model, 429, f"No {provider} slot free within {timeout:.0f}s")
+    try:
+        # Time only the call itself, not the wait for a slot
+        t1 = time.perf_counter()
+        response, error = await query_fn(
+            model,
+            messages,
+            timeout - (t1 - t0),
+            messages_json=messages_json
+        )
+    finally:
+        sem.release()
+
+    if key:
+        if error is None:
+            record_latency(key, time.perf_counter() - t1)
+        elif error.status_code == 408:
+            # Limit may be too tight: widen it by a bounded step
+            record_timeout(key, timeout)
+
+    return response, error
+
+
+async def _route_tagged(
+    model: str,
+    messages: List[Dict[str, str]],
+    messages_json: bytes,
+    stage: Optional[str]
+) -> Tuple[str, Optional[Dict[str, Any]], Optional[Any]]:
+    """Route a query and tag the outcome with its model; exceptions become errors."""
+    try:
+        response, error = await _route(model, messages, messages_json=messages_json, stage=stage)
+    except Exception as e:
+        return model, None, ModelError(model, 500, str(e))
+    return model, response, error
+
+
+async def query_council_as_completed(
+    models: List[str],
+    messages: List[Dict[str, str]],
+    stage: Optional[str] = None
+) -> AsyncIterator[Tuple[str, Optional[Dict[str, Any]], Optional[Any]]]:
+    """
+    Query multiple models in parallel, yielding each result as soon as it arrives.
+
+    Lets callers start processing fast responders without waiting for the
+    slowest council member.
+
+    Args:
+        models: List of model identifiers (any provider prefix)
+        messages: List of message dicts to send to each model
+        stage: Council stage name, enabling adaptive per-stage timeouts
+
+    Yields:
+        Tuples of (model, response dict, error) in completion order
+    """
+    # Serialize the shared messages once for the whole fan-out
+    messages_json = encode_messages(messages)
+
+    tasks = [
+        asyncio.create_task(_route_tagged(model, messages, messages_json, stage))
+        for model in models
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # Don't leave provider calls running if the caller stops early
+        for task in tasks:
+            task.cancel()
+
+
+async def query_council_parallel(
+    models: List[str],
+    messages: List[Dict[str, str]],
+    stage: Optional[str] = None
+) -> Tuple[Dict[str, Optional[Dict[str, Any]]], List[Any]]:
+    """
+    Query multiple models across all providers in parallel.
+
+    Args:
+        models: List of model identifiers (any provider prefix)
+        messages: List of message dicts to send to each model
+        stage: Council stage name, enabling adaptive per-stage timeouts
+
+    Returns:
+        Tuple of (responses dict, list of errors)
     """
+    # Pre-seed so responses keep council order regardless of completion order
+    responses = dict.fromkeys(models)
+    errors = []
+
+    async for model, response, error in query_council_as_completed(models, messages, stage):
+        responses[model] = response
+        if error:
+            errors.append(error)
+
+    return responses, errors
+
+
+def _stage1_messages(user_query: str) -> List[Dict[str, str]]:
+    """Build the Stage 1 prompt messages for a user query."""
     # System prompt for concise responses
     system_prompt = """You are a helpful AI assistant. Provide clear, concise, and accurate responses.
 Keep your answers brief and to the point - aim for 2-4 paragraphs maximum unless the question requires more detail.
 Focus on the most important information and avoid unnecessary elaboration."""
 
-    messages = [
+    return [
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": user_query}
     ]
 
+
+async def stage1_stream_responses(
+    user_query: str
+) -> AsyncIterator[Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]]:
+    """
+    Stage 1, incrementally: yield each council model's outcome as it arrives.
+
+    Args:
+        user_query: The user's question
+
+    Yields:
+        Tuples of (result dict, error dict) in completion order. One will be None.
+    """
+    messages = _stage1_messages(user_query)
+
+    async for model, response, error in query_council_as_completed(
+        COUNCIL_MODELS, messages, stage="stage1"
+    ):
+        if response is not None:
+            yield {"model": model, "response": response.get('content', '')}, None
+        elif error is not None:
+            yield None, error.to_dict()
+
+
+async def stage1_collect_responses(user_query: str) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Stage 1: Collect individual responses from all council models.
+
+    Args:
+        user_query: The user's question
+
+    Returns:
+        Tuple of (results list, errors list)
+    """
+    messages = _stage1_messages(user_query)
+
     # Query all models in parallel
-    responses, errors = await query_models_parallel(COUNCIL_MODELS, messages)
+    responses, errors = await query_council_parallel(COUNCIL_MODELS, messages, stage="stage1")
 
     # Format results
     stage1_results = []
@@ -93,7 +318,7 @@ Your evaluation:"""
     messages = [{"role": "user", "content": ranking_prompt}]
 
     # Get rankings from all council models in parallel
-    responses, errors = await query_models_parallel(COUNCIL_MODELS, messages)
+    responses, errors = await query_council_parallel(COUNCIL_MODELS, messages, stage="stage2")
 
     # Format results
     stage2_results = []
@@ -160,7 +385,7 @@ Do NOT repeat what each model said. Just give the best synthesized answer:"""
     messages = [{"role": "user", "content": chairman_prompt}]
 
     # Query the chairman model
-    response, error = await query_model(CHAIRMAN_MODEL, messages)
+    response, error = await _route(CHAIRMAN_MODEL, messages)
 
     if response is None or error is not None:
         # Fallback if chairman fails
@@ -276,7 +501,7 @@ Title:"""
     messages = [{"role": "user", "content": title_prompt}]
 
     # Use grok for title generation (free tier)
-    response, error = await query_model("x-ai/grok-4.1-fast:free", messages, timeout=30.0)
+    response, error = await _route("x-ai/grok-4.1-fast:free", messages, timeout=30.0)
 
     if response is None or error is not None:
         # Fallback to a generic title
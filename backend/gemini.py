@@ -1,8 +1,17 @@
 """Google Gemini API client for making LLM requests."""
 
 import asyncio
+import logging
 from typing import List, Dict, Any, Optional, Tuple
-from .config import GOOGLE_API_KEY
+from .config import get_settings, GEMINI_API_URL
+from .openrouter import post_json, ProviderHTTPError
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# OpenAI-style roles -> Gemini roles (system prompts go in systemInstruction)
+_ROLE_MAP = {"assistant": "model", "user": "user"}
 
 
 class GeminiError:
@@ -23,98 +32,67 @@ class GeminiError:
 async def query_gemini_model(
     model: str,
     messages: List[Dict[str, str]],
-    timeout: float = 120.0
+    timeout: float = 120.0,
+    messages_json: Optional[bytes] = None
 ) -> Tuple[Optional[Dict[str, Any]], Optional[GeminiError]]:
     """
-    Query a Google Gemini model via the official SDK.
+    Query a Google Gemini model via the generateContent REST API.
 
     Args:
         model: Gemini model identifier (e.g., "gemini/gemini-2.0-flash")
         messages: List of message dicts with 'role' and 'content'
         timeout: Request timeout in seconds
+        messages_json: Unused; accepted for a uniform provider signature
+                       (Gemini's request body has a different shape)
 
     Returns:
         Tuple of (response dict, error). One will be None.
     """
     # Extract actual model name (remove "gemini/" prefix)
     actual_model = model.replace("gemini/", "")
+
+    # Convert messages to Gemini format
+    payload = {
+        'contents': [
+            {'role': _ROLE_MAP.get(m['role'], 'user'), 'parts': [{'text': m['content']}]}
+            for m in messages if m['role'] != 'system'
+        ]
+    }
+    system_text = "\n\n".join(m['content'] for m in messages if m['role'] == 'system')
+    if system_text:
+        payload['systemInstruction'] = {'parts': [{'text': system_text}]}
+
+    # API key goes in a header rather than the query string so it never
+    # appears in URLs echoed back in error messages
+    headers = {
+        "x-goog-api-key": settings.GOOGLE_API_KEY or "",
+        "Content-Type": "application/json",
+    }
     
     try:
-        # Import here to avoid issues if SDK not installed
-        import google.generativeai as genai
-        
-        # Configure the SDK
-        genai.configure(api_key=GOOGLE_API_KEY)
-        
-        # Run the synchronous SDK call in a thread pool
-        def _call_gemini():
-            gemini_model = genai.GenerativeModel(actual_model)
-            
-            # Convert messages to Gemini format
-            # Gemini uses 'user' and 'model' roles, and expects a different structure
-            gemini_history = []
-            current_message = None
-            
-            for msg in messages:
-                role = msg['role']
-                content = msg['content']
-                
-                # Map OpenAI-style roles to Gemini roles
-                if role == 'assistant':
-                    role = 'model'
-                elif role == 'system':
-                    # Gemini doesn't have a system role, prepend to first user message
-                    # or treat as user message
-                    role = 'user'
-                
-                if role == 'user':
-                    current_message = content
-                    gemini_history.append({'role': 'user', 'parts': [content]})
-                else:
-                    gemini_history.append({'role': 'model', 'parts': [content]})
-            
-            # If the last message is from user, we need to generate a response
-            if gemini_history and gemini_history[-1]['role'] == 'user':
-                # Use chat for multi-turn or generate_content for single turn
-                if len(gemini_history) == 1:
-                    response = gemini_model.generate_content(current_message)
-                else:
-                    # Start chat with history (excluding the last user message)
-                    chat = gemini_model.start_chat(history=gemini_history[:-1])
-                    response = chat.send_message(current_message)
-                
-                return response.text
-            
-            return ""
-        
-        # Execute with timeout
-        loop = asyncio.get_event_loop()
-        content = await asyncio.wait_for(
-            loop.run_in_executor(None, _call_gemini),
-            timeout=timeout
+        data = await post_json(
+            f"{GEMINI_API_URL}/{actual_model}:generateContent",
+            headers,
+            payload,
+            timeout
         )
+
+        parts = data['candidates'][0]['content']['parts']
+        content = "".join(part.get('text', '') for part in parts)
         
         return {
             'content': content,
             'reasoning_details': None
         }, None
 
+    except ProviderHTTPError as e:
+        logger.warning("Error querying Gemini model %s: %s", model, e)
+        return None, GeminiError(model, e.status_code, e.message)
+
     except asyncio.TimeoutError:
-        print(f"Timeout querying Gemini model {model}")
-        return None, GeminiError(model, 408, f"Request timed out after {timeout}s")
-    
-    except ImportError as e:
-        print(f"Google Generative AI SDK not installed: {e}")
-        return None, GeminiError(model, 500, "Google Generative AI SDK not installed. Run: pip install google-generativeai")
+        logger.warning("Timeout querying Gemini model %s", model)
+        return None, GeminiError(model, 408, f"Request timed out after {timeout:.0f}s")
     
     except Exception as e:
-        print(f"Error querying Gemini model {model}: {e}")
-        error_message = str(e)
-        status_code = 500
-        
-        # Try to extract status code from exception if available
-        if hasattr(e, 'status_code'):
-            status_code = e.status_code
-        
-        return None, GeminiError(model, status_code, error_message)
-
+        logger.warning("Error querying Gemini model %s: %s", model, e)
+        return None, GeminiError(model, 500, str(e))
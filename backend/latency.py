@@ -0,0 +1,126 @@
+"""Per-model latency tracking for adaptive request timeouts."""
+
+import json
+import math
+import os
+from pathlib import Path
+from typing import Dict, Tuple
+from .config import LATENCY_STATS_PATH
+
+# Weight of the newest sample in the exponential moving averages
+EMA_ALPHA = 0.2
+
+# Adaptive timeouts never drop below this many seconds
+MIN_TIMEOUT = 5.0
+
+# Factor a limit grows by each time a call runs into it
+TIMEOUT_GROWTH = 1.5
+
+# "stage:model" -> (EMA of latency, EMA of latency variance), in seconds
+_latency_stats: Dict[str, Tuple[float, float]] = {}
+
+
+def latency_key(model: str, stage: str) -> str:
+    """
+    Stats key for a model in a given council stage.
+
+    Stages send very different prompts (e.g. stage 2 embeds every stage 1
+    answer), so each (stage, model) pair keeps its own averages.
+
+    Args:
+        model: Model identifier
+        stage: Council stage name (e.g. "stage1")
+
+    Returns:
+        Key for record_latency / record_timeout / effective_timeout
+    """
+    return f"{stage}:{model}"
+
+
+def record_latency(key: str, seconds: float):
+    """
+    Fold an observed call latency into the moving averages for a key.
+
+    Args:
+        key: Stats key from latency_key
+        seconds: Wall-clock duration of the call
+    """
+    stats = _latency_stats.get(key)
+    if stats is None:
+        # No history yet: assume stdev on the order of the first sample
+        _latency_stats[key] = (seconds, seconds ** 2)
+        return
+
+    mean, var = stats
+    diff = seconds - mean
+    incr = EMA_ALPHA * diff
+    _latency_stats[key] = (mean + incr, (1 - EMA_ALPHA) * (var + diff * incr))
+
+
+def record_timeout(key: str, limit: float):
+    """
+    Widen a key's limit by a bounded factor after a call hit it.
+
+    Re-seeds the averages so the next effective_timeout is TIMEOUT_GROWTH times
+    the limit that was hit (still capped by the caller's timeout). A slowed-down
+    model recovers in a few turns, while a dead one keeps being cut off well
+    short of the full timeout instead of getting it back in one step.
+
+    Args:
+        key: Stats key from latency_key
+        limit: The timeout the call was given, in seconds
+    """
+    # With stdev == mean, 3 * mean + 6 * stdev == 9 * mean
+    mean = TIMEOUT_GROWTH * limit / 9
+    _latency_stats[key] = (mean, mean ** 2)
+
+
+def effective_timeout(key: str, timeout: float) -> float:
+    """
+    Timeout to use for a key, tightened from its observed latency.
+
+    Args:
+        key: Stats key from latency_key
+        timeout: The caller's timeout, used as the ceiling
+
+    Returns:
+        min(timeout, 3 * mean + 6 * stdev), floored at MIN_TIMEOUT
+    """
+    stats = _latency_stats.get(key)
+    if stats is None:
+        return timeout
+
+    mean, var = stats
+    adaptive = 3 * mean + 6 * math.sqrt(var)
+    return min(timeout, max(MIN_TIMEOUT, adaptive))
+
+
+def load_latency_stats(path: str = LATENCY_STATS_PATH):
+    """
+    Load persisted latency stats, if any.
+
+    Args:
+        path: JSON file written by save_latency_stats
+    """
+    if not os.path.exists(path):
+        return
+
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+        _latency_stats.update({key: (mean, var) for key, (mean, var) in data.items()})
+    except (OSError, ValueError, TypeError):
+        # Stale or corrupt stats only cost us the warm start
+        pass
+
+
+def save_latency_stats(path: str = LATENCY_STATS_PATH):
+    """
+    Persist latency stats so adaptive timeouts survive restarts.
+
+    Args:
+        path: Destination JSON file
+    """
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(_latency_stats, f, indent=2)
@@ -8,14 +8,39 @@ from typing import List, Dict, Any
 import uuid
 import json
 import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
 
 from . import storage
-from .council import run_full_council, generate_conversation_title, stage1_collect_responses, stage2_collect_rankings, stage3_synthesize_final, calculate_aggregate_rankings
+from . import openrouter
+from . import latency
+from .config import get_settings, COUNCIL_MODELS
+from .council import warmup, run_full_council, generate_conversation_title, stage1_stream_responses, stage2_collect_rankings, stage3_synthesize_final, calculate_aggregate_rankings
+
+# Configure logging once for the app; provider clients log via module loggers
+logging.basicConfig(
+    handlers=[logging.StreamHandler()],
+    level=get_settings().LOG_LEVEL,
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup/shutdown hooks."""
+    latency.load_latency_stats()
+    if get_settings().COUNCIL_WARMUP:
+        await warmup()
+    yield
+    # Release pooled HTTP connections
+    await openrouter.aclose()
+    latency.save_latency_stats()
 
-app = FastAPI(title="AI Peer Review API")
+
+app = FastAPI(title="AI Peer Review API", lifespan=lifespan)
 
 # Enable CORS for local development and production
-import os
 CORS_ORIGINS = os.getenv("CORS_ORIGINS", "http://localhost:5173,http://localhost:5174,http://localhost:3000").split(",")
 app.add_middleware(
     CORSMiddleware,
@@ -153,8 +178,18 @@ async def send_message_stream(conversation_id: str, request: SendMessageRequest)
 
             # Stage 1: Collect responses
             yield f"data: {json.dumps({'type': 'stage1_start'})}\n\n"
-            stage1_results, stage1_errors = await stage1_collect_responses(request.content)
+            stage1_results, stage1_errors = [], []
+            async for result, error in stage1_stream_responses(request.content):
+                # Send each model's answer as soon as it arrives
+                if result is not None:
+                    stage1_results.append(result)
+                    yield f"data: {json.dumps({'type': 'stage1_model_complete', 'data': result})}\n\n"
+                else:
+                    stage1_errors.append(error)
             all_errors.extend(stage1_errors)
+
+            # Restore council order so Response A/B/C labels stay stable
+            stage1_results.sort(key=lambda r: COUNCIL_MODELS.index(r['model']))
             
             # Send stage1 complete with any errors
             yield f"data: {json.dumps({'type': 'stage1_complete', 'data': stage1_results, 'errors': stage1_errors})}\n\n"
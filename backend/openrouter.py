@@ -1,81 +1,242 @@
 """Multi-provider API client for making LLM requests."""
 
+import asyncio
+import logging
+import aiohttp
 import httpx
-from typing import List, Dict, Any, Optional, Tuple
-from .config import OPENROUTER_API_KEY, OPENROUTER_API_URL
+from typing import List, Dict, Any, Optional, Tuple, Union
+from ._json import dumps, loads
+from .config import get_settings, OPENROUTER_API_URL
 
+logger = logging.getLogger(__name__)
 
-class ModelError:
-    """Represents an error from a model query."""
-    def __init__(self, model: str, status_code: int, message: str):
-        self.model = model
+settings = get_settings()
+
+# Shared HTTP clients so keep-alive connections are reused across calls.
+# aiohttp is used by default; httpx is kept as a fallback (HTTP_CLIENT=httpx).
+_client: Optional[httpx.AsyncClient] = None
+_session: Optional[aiohttp.ClientSession] = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """
+    Get the shared async HTTP client, creating it on first use.
+
+    Returns:
+        Long-lived httpx.AsyncClient
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            # HTTP/2 multiplexes concurrent calls to one host over a single connection
+            http2=True,
+            timeout=httpx.Timeout(120.0),
+            # Raised pool limits (see config.Settings) so council fan-out never waits for a slot
+            limits=httpx.Limits(
+                max_connections=settings.HTTPX_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTPX_MAX_KEEPALIVE,
+                keepalive_expiry=60.0,
+            ),
+        )
+    return _client
+
+
+def get_session() -> aiohttp.ClientSession:
+    """
+    Get the shared aiohttp session, creating it on first use.
+
+    Must be called from within a running event loop.
+
+    Returns:
+        Long-lived aiohttp.ClientSession
+    """
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=200, limit_per_host=50, keepalive_timeout=75),
+            timeout=aiohttp.ClientTimeout(total=120),
+        )
+    return _session
+
+
+async def aclose():
+    """Close the shared HTTP clients (called on application shutdown)."""
+    global _client, _session
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+    if _session is not None:
+        await _session.close()
+        _session = None
+
+
+async def head(url: str, timeout: float = 5.0):
+    """
+    Send a HEAD request with the configured transport, ignoring the status.
+
+    Used to open and pool a keep-alive connection ahead of real traffic.
+
+    Args:
+        url: URL to request
+        timeout: Request timeout in seconds
+    """
+    if settings.HTTP_CLIENT == "httpx":
+        await get_client().head(url, timeout=timeout)
+        return
+
+    async with get_session().head(url, timeout=aiohttp.ClientTimeout(total=timeout)):
+        pass
+
+
+class ProviderHTTPError(Exception):
+    """Raised by post_json when a provider API returns a non-2xx status."""
+    def __init__(self, status_code: int, message: str):
+        super().__init__(message)
         self.status_code = status_code
         self.message = message
-    
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            'model': self.model,
-            'status_code': self.status_code,
-            'message': self.message
-        }
 
 
-def get_provider(model: str) -> str:
+def _error_message(status_code: int, content_type: str, body: bytes, default: str) -> str:
     """
-    Determine the provider based on model identifier prefix.
-    
+    Extract the provider's error message from an error response body.
+
     Args:
-        model: Model identifier (e.g., "perplexity/sonar", "gemini/gemini-2.0-flash")
-    
+        status_code: HTTP status of the response
+        content_type: Response Content-Type header
+        body: Raw response body
+        default: Message to use if the body doesn't carry one
+
     Returns:
-        Provider name: "perplexity", "gemini", or "openrouter"
+        The provider's error message, or default
     """
-    if model.startswith("perplexity/"):
-        return "perplexity"
-    elif model.startswith("gemini/"):
-        return "gemini"
-    else:
-        return "openrouter"
+    if "application/json" not in content_type:
+        if status_code >= 500 and body:
+            logger.warning("Non-JSON %s response body: %r", status_code, body[:512])
+        return default
 
+    try:
+        error_data = loads(body)
+    except ValueError:
+        return default
 
-async def query_model(
-    model: str,
-    messages: List[Dict[str, str]],
-    timeout: float = 120.0
-) -> Tuple[Optional[Dict[str, Any]], Optional[ModelError]]:
+    error = error_data.get('error') if isinstance(error_data, dict) else None
+    if isinstance(error, dict):
+        return error.get('message', default)
+    return default
+
+
+def encode_messages(messages: List[Dict[str, str]]) -> bytes:
     """
-    Query a model via the appropriate provider API.
+    Serialize messages once as the open prefix of a chat-completions body.
+
+    The council sends identical messages to every model; encoding them once
+    and splicing in each model name with chat_body() avoids N re-encodes.
 
     Args:
-        model: Model identifier with optional provider prefix
-               - "perplexity/sonar" -> Perplexity API
-               - "gemini/gemini-2.0-flash" -> Google Gemini API
-               - "x-ai/grok-4.1-fast:free" -> OpenRouter API (default)
         messages: List of message dicts with 'role' and 'content'
+
+    Returns:
+        JSON bytes of {"messages": [...]} without the closing brace
+    """
+    return dumps({"messages": messages})[:-1]
+
+
+def chat_body(messages_json: bytes, model: str) -> bytes:
+    """
+    Complete a chat-completions body from an encode_messages() prefix.
+
+    Args:
+        messages_json: Prefix returned by encode_messages
+        model: Model name to send
+
+    Returns:
+        JSON bytes of {"messages": [...], "model": model}
+    """
+    return messages_json + b',"model":' + dumps(model) + b'}'
+
+
+async def post_json(
+    url: str,
+    headers: Dict[str, str],
+    payload: Union[Dict[str, Any], bytes],
+    timeout: float = 120.0
+) -> Dict[str, Any]:
+    """
+    POST a JSON payload using the configured HTTP transport.
+
+    Args:
+        url: Endpoint URL
+        headers: Request headers (including Content-Type: application/json)
+        payload: JSON-serializable request body, or already-encoded JSON bytes
         timeout: Request timeout in seconds
 
     Returns:
-        Tuple of (response dict, error). One will be None.
+        Decoded JSON response body
+
+    Raises:
+        ProviderHTTPError: If the response status is not 2xx
+        asyncio.TimeoutError: If the request times out
     """
-    provider = get_provider(model)
-    
-    # Route to appropriate provider
-    if provider == "perplexity":
-        from .perplexity import query_perplexity_model
-        return await query_perplexity_model(model, messages, timeout)
-    
-    elif provider == "gemini":
-        from .gemini import query_gemini_model
-        return await query_gemini_model(model, messages, timeout)
+    body = payload if isinstance(payload, bytes) else dumps(payload)
+
+    if settings.HTTP_CLIENT == "httpx":
+        try:
+            response = await get_client().post(url, headers=headers, content=body, timeout=timeout)
+            response.raise_for_status()
+            return loads(response.content)
+        except httpx.HTTPStatusError as e:
+            raise ProviderHTTPError(
+                e.response.status_code,
+                _error_message(
+                    e.response.status_code,
+                    e.response.headers.get("content-type", ""),
+                    e.response.content,
+                    str(e)
+                )
+            ) from e
+        except httpx.TimeoutException as e:
+            raise asyncio.TimeoutError(str(e)) from e
+
+    session = get_session()
+    async with session.post(
+        url,
+        headers=headers,
+        data=body,
+        timeout=aiohttp.ClientTimeout(total=timeout)
+    ) as response:
+        if response.status >= 400:
+            # Read the body before raising so the provider's message is kept
+            body = await response.read()
+            try:
+                response.raise_for_status()
+            except aiohttp.ClientResponseError as e:
+                raise ProviderHTTPError(
+                    e.status,
+                    _error_message(e.status, response.headers.get("Content-Type", ""), body, e.message)
+                ) from e
+        return loads(await response.read())
+
+
+class ModelError:
+    """Represents an error from a model query."""
+    def __init__(self, model: str, status_code: int, message: str):
+        self.model = model
+        self.status_code = status_code
+        self.message = message
     
-    # Default: OpenRouter
-    return await _query_openrouter_model(model, messages, timeout)
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'model': self.model,
+            'status_code': self.status_code,
+            'message': self.message
+        }
 
 
-async def _query_openrouter_model(
+async def query_model(
     model: str,
     messages: List[Dict[str, str]],
-    timeout: float = 120.0
+    timeout: float = 120.0,
+    messages_json: Optional[bytes] = None
 ) -> Tuple[Optional[Dict[str, Any]], Optional[ModelError]]:
     """
     Query a model via OpenRouter API.
@@ -84,90 +245,37 @@ async def _query_openrouter_model(
         model: OpenRouter model identifier (e.g., "openai/gpt-4o")
         messages: List of message dicts with 'role' and 'content'
         timeout: Request timeout in seconds
+        messages_json: Optional encode_messages(messages) prefix to reuse
 
     Returns:
         Tuple of (response dict, error). One will be None.
     """
     headers = {
-        "Authorization": f"Bearer {OPENROUTER_API_KEY}",
+        "Authorization": f"Bearer {settings.OPENROUTER_API_KEY}",
         "Content-Type": "application/json",
     }
 
-    payload = {
-        "model": model,
-        "messages": messages,
-    }
+    if messages_json is None:
+        messages_json = encode_messages(messages)
 
     try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.post(
-                OPENROUTER_API_URL,
-                headers=headers,
-                json=payload
-            )
-            response.raise_for_status()
-
-            data = response.json()
-            message = data['choices'][0]['message']
+        data = await post_json(OPENROUTER_API_URL, headers, chat_body(messages_json, model), timeout)
+        message = data['choices'][0]['message']
 
-            return {
-                'content': message.get('content'),
-                'reasoning_details': message.get('reasoning_details')
-            }, None
+        return {
+            'content': message.get('content'),
+            'reasoning_details': message.get('reasoning_details')
+        }, None
 
-    except httpx.HTTPStatusError as e:
-        status_code = e.response.status_code
-        error_message = str(e)
-        
-        # Try to get more details from response body
-        try:
-            error_data = e.response.json()
-            if 'error' in error_data:
-                error_message = error_data['error'].get('message', str(e))
-        except:
-            pass
-        
-        print(f"Error querying model {model}: {e}")
-        return None, ModelError(model, status_code, error_message)
+    except ProviderHTTPError as e:
+        logger.warning("Error querying model %s: %s", model, e)
+        return None, ModelError(model, e.status_code, e.message)
     
-    except httpx.TimeoutException as e:
-        print(f"Timeout querying model {model}: {e}")
-        return None, ModelError(model, 408, f"Request timed out after {timeout}s")
+    except asyncio.TimeoutError as e:
+        logger.warning("Timeout querying model %s: %s", model, e)
+        return None, ModelError(model, 408, f"Request timed out after {timeout:.0f}s")
     
     except Exception as e:
-        print(f"Error querying model {model}: {e}")
+        logger.warning("Error querying model %s: %s", model, e)
         return None, ModelError(model, 500, str(e))
 
-
-async def query_models_parallel(
-    models: List[str],
-    messages: List[Dict[str, str]]
-) -> Tuple[Dict[str, Optional[Dict[str, Any]]], List[ModelError]]:
-    """
-    Query multiple models in parallel.
-
-    Args:
-        models: List of OpenRouter model identifiers
-        messages: List of message dicts to send to each model
-
-    Returns:
-        Tuple of (responses dict, list of errors)
-    """
-    import asyncio
-
-    # Create tasks for all models
-    tasks = [query_model(model, messages) for model in models]
-
-    # Wait for all to complete
-    results = await asyncio.gather(*tasks)
-
-    # Separate responses and errors
-    responses = {}
-    errors = []
-    
-    for model, (response, error) in zip(models, results):
-        responses[model] = response
-        if error:
-            errors.append(error)
-
-    return responses, errors
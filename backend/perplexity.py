@@ -1,8 +1,14 @@
 """Perplexity API client for making LLM requests."""
 
 import asyncio
+import logging
 from typing import List, Dict, Any, Optional, Tuple
-from .config import PERPLEXITY_API_KEY
+from .config import get_settings, PERPLEXITY_API_URL
+from .openrouter import post_json, encode_messages, chat_body, ProviderHTTPError
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
 
 
 class PerplexityError:
@@ -23,66 +29,51 @@ class PerplexityError:
 async def query_perplexity_model(
     model: str,
     messages: List[Dict[str, str]],
-    timeout: float = 120.0
+    timeout: float = 120.0,
+    messages_json: Optional[bytes] = None
 ) -> Tuple[Optional[Dict[str, Any]], Optional[PerplexityError]]:
     """
-    Query a Perplexity model via the official SDK.
+    Query a Perplexity model via its OpenAI-compatible chat completions API.
 
     Args:
         model: Perplexity model identifier (e.g., "perplexity/sonar")
         messages: List of message dicts with 'role' and 'content'
         timeout: Request timeout in seconds
+        messages_json: Optional encode_messages(messages) prefix to reuse
 
     Returns:
         Tuple of (response dict, error). One will be None.
     """
     # Extract actual model name (remove "perplexity/" prefix)
     actual_model = model.replace("perplexity/", "")
+
+    headers = {
+        "Authorization": f"Bearer {settings.PERPLEXITY_API_KEY}",
+        "Content-Type": "application/json",
+    }
+
+    if messages_json is None:
+        messages_json = encode_messages(messages)
     
     try:
-        # Import here to avoid issues if SDK not installed
-        from perplexity import Perplexity
-        
-        # Run the synchronous SDK call in a thread pool
-        def _call_perplexity():
-            client = Perplexity(api_key=PERPLEXITY_API_KEY)
-            response = client.chat.completions.create(
-                model=actual_model,
-                messages=messages
-            )
-            return response
-        
-        # Execute with timeout
-        loop = asyncio.get_event_loop()
-        response = await asyncio.wait_for(
-            loop.run_in_executor(None, _call_perplexity),
-            timeout=timeout
-        )
-        
+        data = await post_json(PERPLEXITY_API_URL, headers, chat_body(messages_json, actual_model), timeout)
+
         # Extract content from response
-        content = response.choices[0].message.content
+        content = data['choices'][0]['message']['content']
         
         return {
             'content': content,
             'reasoning_details': None
         }, None
 
+    except ProviderHTTPError as e:
+        logger.warning("Error querying Perplexity model %s: %s", model, e)
+        return None, PerplexityError(model, e.status_code, e.message)
+
     except asyncio.TimeoutError:
-        print(f"Timeout querying Perplexity model {model}")
-        return None, PerplexityError(model, 408, f"Request timed out after {timeout}s")
-    
-    except ImportError as e:
-        print(f"Perplexity SDK not installed: {e}")
-        return None, PerplexityError(model, 500, "Perplexity SDK not installed. Run: pip install perplexityai")
+        logger.warning("Timeout querying Perplexity model %s", model)
+        return None, PerplexityError(model, 408, f"Request timed out after {timeout:.0f}s")
     
     except Exception as e:
-        print(f"Error querying Perplexity model {model}: {e}")
-        error_message = str(e)
-        status_code = 500
-        
-        # Try to extract status code from exception if available
-        if hasattr(e, 'status_code'):
-            status_code = e.status_code
-        
-        return None, PerplexityError(model, status_code, error_message)
-
+        logger.warning("Error querying Perplexity model %s: %s", model, e)
+        return None, PerplexityError(model, 500, str(e))
@@ -124,6 +124,17 @@ function App() {
             });
             break;
 
+          case 'stage1_model_complete':
+            // Copy rather than mutate and dedupe by model: StrictMode runs updaters twice
+            setCurrentConversation((prev) => {
+              const messages = [...prev.messages];
+              const lastMsg = messages[messages.length - 1];
+              const stage1 = (lastMsg.stage1 || []).filter((r) => r.model !== event.data.model);
+              messages[messages.length - 1] = { ...lastMsg, stage1: [...stage1, event.data] };
+              return { ...prev, messages };
+            });
+            break;
+
           case 'stage1_complete':
             setCurrentConversation((prev) => {
               const messages = [...prev.messages];
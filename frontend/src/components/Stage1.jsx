@@ -3,22 +3,25 @@ import ReactMarkdown from 'react-markdown';
 import './Stage1.css';
 
 export default function Stage1({ responses }) {
-  const [activeTab, setActiveTab] = useState(0);
+  // Track the selected tab by model so it survives reordering of responses
+  const [activeModel, setActiveModel] = useState(null);
 
   if (!responses || responses.length === 0) {
     return null;
   }
 
+  const active = responses.find((resp) => resp.model === activeModel) || responses[0];
+
   return (
     <div className="stage stage1">
       <h3 className="stage-title">Stage 1: Individual Responses</h3>
 
       <div className="tabs">
-        {responses.map((resp, index) => (
+        {responses.map((resp) => (
           <button
-            key={index}
-            className={`tab ${activeTab === index ? 'active' : ''}`}
-            onClick={() => setActiveTab(index)}
+            key={resp.model}
+            className={`tab ${resp.model === active.model ? 'active' : ''}`}
+            onClick={() => setActiveModel(resp.model)}
           >
             {resp.model.split('/')[1] || resp.model}
           </button>
@@ -26,9 +29,9 @@ export default function Stage1({ responses }) {
       </div>
 
       <div className="tab-content">
-        <div className="model-name">{responses[activeTab].model}</div>
+        <div className="model-name">{active.model}</div>
         <div className="response-text markdown-content">
-          <ReactMarkdown>{responses[activeTab].response}</ReactMarkdown>
+          <ReactMarkdown>{active.response}</ReactMarkdown>
         </div>
       </div>
     </div>